@@ -1,10 +1,12 @@
-from flask import Flask, request, jsonify, session
+from flask import Flask, request, session
 from flask_cors import CORS
 from backend.models.database import Database
 from backend.utils.cookie_validator import CookieValidator
 import os
 import secrets
 
+import orjson
+
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', secrets.token_hex(16))
 
@@ -15,37 +17,51 @@ CORS(app, supports_credentials=True)
 db = Database()
 validator = CookieValidator()
 
+def ojson(obj, status=200):
+    """Build a JSON response with orjson, which serializes at C speed"""
+    return app.response_class(orjson.dumps(obj), status=status, mimetype='application/json')
+
+def request_json():
+    """Parse the request body with orjson; returns None on empty/invalid input"""
+    body = request.get_data()
+    if not body:
+        return None
+    try:
+        return orjson.loads(body)
+    except orjson.JSONDecodeError:
+        return None
+
 @app.route('/api/register', methods=['POST'])
 def register():
     """User registration endpoint"""
-    data = request.get_json()
+    data = request_json()
     
     if not data or not data.get('username') or not data.get('password'):
-        return jsonify({'error': 'Username and password required'}), 400
+        return ojson({'error': 'Username and password required'}), 400
     
     username = data['username'].strip()
     password = data['password']
     
     if len(username) < 3:
-        return jsonify({'error': 'Username must be at least 3 characters'}), 400
+        return ojson({'error': 'Username must be at least 3 characters'}), 400
     
     if len(password) < 6:
-        return jsonify({'error': 'Password must be at least 6 characters'}), 400
+        return ojson({'error': 'Password must be at least 6 characters'}), 400
     
     success = db.create_user(username, password)
     
     if success:
-        return jsonify({'message': 'User registered successfully'}), 201
+        return ojson({'message': 'User registered successfully'}), 201
     else:
-        return jsonify({'error': 'Username already exists'}), 409
+        return ojson({'error': 'Username already exists'}), 409
 
 @app.route('/api/login', methods=['POST'])
 def login():
     """User login endpoint"""
-    data = request.get_json()
+    data = request_json()
     
     if not data or not data.get('username') or not data.get('password'):
-        return jsonify({'error': 'Username and password required'}), 400
+        return ojson({'error': 'Username and password required'}), 400
     
     username = data['username'].strip()
     password = data['password']
@@ -55,7 +71,7 @@ def login():
     if user_id:
         session['user_id'] = user_id
         session['username'] = username
-        return jsonify({
+        return ojson({
             'message': 'Login successful',
             'user': {
                 'id': user_id,
@@ -63,24 +79,24 @@ def login():
             }
         }), 200
     else:
-        return jsonify({'error': 'Invalid credentials'}), 401
+        return ojson({'error': 'Invalid credentials'}), 401
 
 @app.route('/api/logout', methods=['POST'])
 def logout():
     """User logout endpoint"""
     session.clear()
-    return jsonify({'message': 'Logged out successfully'}), 200
+    return ojson({'message': 'Logged out successfully'}), 200
 
 @app.route('/api/cookies', methods=['POST'])
 def upload_cookies():
     """Upload cookies for a website"""
     if 'user_id' not in session:
-        return jsonify({'error': 'Authentication required'}), 401
+        return ojson({'error': 'Authentication required'}), 401
     
-    data = request.get_json()
+    data = request_json()
     
     if not data or not data.get('website'):
-        return jsonify({'error': 'Website is required'}), 400
+        return ojson({'error': 'Website is required'}), 400
     
     website = data['website'].strip()
     cookies_data = data.get('cookies', [])
@@ -106,30 +122,31 @@ def upload_cookies():
                 })
     
     if not cookies:
-        return jsonify({'error': 'No valid cookies provided'}), 400
+        return ojson({'error': 'No valid cookies provided'}), 400
     
     # Save cookies to database
     success = db.save_cookies(session['user_id'], website, cookies)
     
     if success:
-        return jsonify({
+        return ojson({
             'message': f'Successfully uploaded {len(cookies)} cookies for {website}',
             'count': len(cookies)
         }), 201
     else:
-        return jsonify({'error': 'Failed to save cookies'}), 500
+        return ojson({'error': 'Failed to save cookies'}), 500
 
 @app.route('/api/cookies', methods=['GET'])
 def get_cookies():
     """Get user's cookies, optionally filtered by website"""
     if 'user_id' not in session:
-        return jsonify({'error': 'Authentication required'}), 401
+        return ojson({'error': 'Authentication required'}), 401
     
     website = request.args.get('website')
     cookies = db.get_user_cookies(session['user_id'], website)
-    
-    return jsonify({
-        'cookies': cookies,
+
+    # Cookie records stay compact internally; expand to dicts only here
+    return ojson({
+        'cookies': [cookie._asdict() for cookie in cookies],
         'count': len(cookies)
     }), 200
 
@@ -137,51 +154,46 @@ def get_cookies():
 def delete_cookie(cookie_id):
     """Delete a specific cookie"""
     if 'user_id' not in session:
-        return jsonify({'error': 'Authentication required'}), 401
+        return ojson({'error': 'Authentication required'}), 401
     
     success = db.delete_cookie(session['user_id'], cookie_id)
     
     if success:
-        return jsonify({'message': 'Cookie deleted successfully'}), 200
+        return ojson({'message': 'Cookie deleted successfully'}), 200
     else:
-        return jsonify({'error': 'Cookie not found or access denied'}), 404
+        return ojson({'error': 'Cookie not found or access denied'}), 404
 
 @app.route('/api/validate', methods=['POST'])
 def validate_cookies():
-    """Validate cookies for a specific website"""
+    """Validate cookies for a website, or all of the user's websites"""
     if 'user_id' not in session:
-        return jsonify({'error': 'Authentication required'}), 401
-    
-    data = request.get_json()
-    
-    if not data or not data.get('website'):
-        return jsonify({'error': 'Website is required'}), 400
-    
-    website = data['website'].strip()
-    
-    # Get cookies for the website
-    cookies = db.get_user_cookies(session['user_id'], website)
-    
+        return ojson({'error': 'Authentication required'}), 401
+
+    data = request_json() or {}
+    website = (data.get('website') or '').strip()
+
+    # Get cookies for the website (or all websites when none is given)
+    cookies = db.get_user_cookies(session['user_id'], website or None)
+
     if not cookies:
-        return jsonify({'error': 'No cookies found for this website'}), 404
-    
-    # Validate cookies
+        return ojson({'error': 'No cookies found for this website'}), 404
+
+    # Group by website and validate concurrently
+    website_cookies = {}
+    for cookie in cookies:
+        website_cookies.setdefault(cookie.website, []).append(cookie)
+
     try:
-        validation_results = validator.validate_cookies_for_website(website, cookies)
-        
-        # Update database with validation results
-        valid_count = 0
-        invalid_count = 0
-        
-        for cookie_id, is_valid in validation_results:
-            db.update_cookie_validity(cookie_id, is_valid)
-            if is_valid:
-                valid_count += 1
-            else:
-                invalid_count += 1
-        
-        return jsonify({
-            'message': f'Validated {len(cookies)} cookies for {website}',
+        validation_results = validator.validate_cookies_for_websites(website_cookies)
+
+        # Update database with validation results in one transaction
+        db.bulk_update_validity(validation_results)
+
+        valid_count = sum(1 for _, is_valid in validation_results if is_valid)
+        invalid_count = len(validation_results) - valid_count
+
+        return ojson({
+            'message': f'Validated {len(cookies)} cookies for {website or "all websites"}',
             'results': {
                 'total': len(cookies),
                 'valid': valid_count,
@@ -190,15 +202,15 @@ def validate_cookies():
         }), 200
     
     except Exception as e:
-        return jsonify({'error': f'Validation failed: {str(e)}'}), 500
+        return ojson({'error': f'Validation failed: {str(e)}'}), 500
 
 @app.route('/api/user', methods=['GET'])
 def get_user_info():
     """Get current user information"""
     if 'user_id' not in session:
-        return jsonify({'error': 'Authentication required'}), 401
+        return ojson({'error': 'Authentication required'}), 401
     
-    return jsonify({
+    return ojson({
         'user': {
             'id': session['user_id'],
             'username': session['username']
@@ -208,7 +220,8 @@ def get_user_info():
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({'status': 'healthy'}), 200
+    return ojson({'status': 'healthy'}), 200
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    # Dev server only; production runs through wsgi.py (gunicorn + gevent)
+    app.run(debug=bool(os.environ.get('FLASK_DEBUG')), host='0.0.0.0', port=5000)
\ No newline at end of file
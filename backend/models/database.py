@@ -1,18 +1,107 @@
+import hmac
+import os
 import sqlite3
-import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, NamedTuple, Optional
+
+import cachetools
+from argon2 import PasswordHasher
+from argon2.exceptions import VerifyMismatchError, InvalidHashError
+
+# Argon2id with a bounded per-login budget (~7 MB memory, ~7 ms CPU).
+# Salt and parameters are baked into the encoded hash string.
+hasher = PasswordHasher(time_cost=2, memory_cost=7168, parallelism=1)
+
+# Verified against when a username doesn't exist, so failed logins cost
+# the same whether or not the account is real
+_DUMMY_HASH = hasher.hash("")
+
+# argon2-cffi releases the GIL while hashing, so a thread pool parallelizes
+# hashing across cores; bounding the workers also caps peak hashing memory
+# at workers x memory_cost
+_HASH_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+
+def _hash_password(password: str) -> str:
+    """Hash a password on the bounded hashing pool"""
+    return _HASH_POOL.submit(hasher.hash, password).result()
+
+def _verify_password(stored_hash: str, password: str) -> None:
+    """Verify a password on the bounded hashing pool; raises on mismatch"""
+    _HASH_POOL.submit(hasher.verify, stored_hash, password).result()
+
+# Pepper for the auth-cache key; per-process random unless pinned via env
+_AUTH_PEPPER = os.environ.get('AUTH_CACHE_PEPPER', '').encode() or os.urandom(32)
+
+class Cookie(NamedTuple):
+    """A stored cookie row; far lighter than a per-row dict, with field
+    access compiled to a C-level offset. Use ._asdict() at the JSON
+    boundary only."""
+    id: int
+    website: str
+    name: str
+    value: str
+    domain: str
+    path: str
+    expires: str
+    is_valid: bool
+    last_validated: str
+    created_at: str
+
+def _cookie_row(cursor, row):
+    """Row factory turning a cookie row into a Cookie record"""
+    return Cookie._make(row)
+
+# Hot-path SQL hoisted to constants so the connection's statement cache
+# sees one stable string per query
+_SQL_INSERT_USER = "INSERT INTO users (username, password_hash) VALUES (?, ?)"
+
+_SQL_SELECT_USER = "SELECT id, password_hash FROM users WHERE username = ?"
+
+_SQL_UPDATE_USER_HASH = "UPDATE users SET password_hash = ? WHERE id = ?"
+
+_SQL_INSERT_COOKIE = '''
+    INSERT OR REPLACE INTO cookies
+    (user_id, website, cookie_name, cookie_value, domain, path, expires, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+'''
+
+# The (? IS NULL OR website = ?) clause folds the filtered and unfiltered
+# lookups into one cached statement; the planner still uses
+# idx_cookies_user_website when a website is given
+_SQL_SELECT_COOKIES = '''
+    SELECT id, website, cookie_name AS name, cookie_value AS value,
+           domain, path, expires, is_valid, last_validated, created_at
+    FROM cookies
+    WHERE user_id = ? AND (? IS NULL OR website = ?)
+    ORDER BY created_at DESC
+'''
+
+_SQL_UPDATE_VALIDITY = '''
+    UPDATE cookies
+    SET is_valid = ?, last_validated = CURRENT_TIMESTAMP
+    WHERE id = ?
+'''
+
+_SQL_DELETE_COOKIE = "DELETE FROM cookies WHERE id = ? AND user_id = ?"
 
 class Database:
     def __init__(self, db_path: str = "cookies.db"):
         self.db_path = db_path
+        self._local = threading.local()
+        # Successfully verified logins, so hot repeat logins skip the argon2
+        # cost; wrong passwords never enter the cache, preserving the full
+        # brute-force cost for attackers
+        self._auth_cache = cachetools.TTLCache(maxsize=1024, ttl=60)
+        self._auth_cache_lock = threading.Lock()
         self.init_db()
-    
+
     def init_db(self):
         """Initialize the database with required tables"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.get_connection()
         cursor = conn.cursor()
-        
+
         # Users table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS users (
@@ -41,55 +130,99 @@ class Database:
                 UNIQUE(user_id, website, cookie_name)
             )
         ''')
-        
+
+        # Indexes for the hot lookups in get_user_cookies and authenticate_user
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_cookies_user_website
+            ON cookies(user_id, website)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_users_username
+            ON users(username)
+        ''')
+
         conn.commit()
-        conn.close()
-    
+
     def get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+        """Get this thread's pooled database connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path, check_same_thread=False, cached_statements=256
+            )
+            cursor = conn.cursor()
+
+            # WAL lets readers proceed alongside a writer; synchronous=NORMAL
+            # drops the per-commit journal fsync while staying durable across
+            # power loss within a checkpoint window
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.execute("PRAGMA mmap_size=268435456")
+            cursor.execute("PRAGMA cache_size=-65536")
+
+            self._local.conn = conn
+        return conn
     
     def create_user(self, username: str, password: str) -> bool:
         """Create a new user"""
         try:
-            password_hash = hashlib.sha256(password.encode()).hexdigest()
+            password_hash = _hash_password(password)
             conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT INTO users (username, password_hash) VALUES (?, ?)",
-                (username, password_hash)
-            )
-            conn.commit()
-            conn.close()
+            with conn:
+                conn.execute(_SQL_INSERT_USER, (username, password_hash))
             return True
         except sqlite3.IntegrityError:
             return False
     
     def authenticate_user(self, username: str, password: str) -> Optional[int]:
         """Authenticate user and return user_id if successful"""
-        password_hash = hashlib.sha256(password.encode()).hexdigest()
+        # Length-prefixing makes the encoding unambiguous; a bare ':' join
+        # would let ('a:b', 'c') and ('a', 'b:c') share a cache key
+        cache_key = hmac.new(
+            _AUTH_PEPPER, f'{len(username)}:{username}:{password}'.encode(), 'sha256'
+        ).digest()
+        with self._auth_cache_lock:
+            cached = self._auth_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute(
-            "SELECT id FROM users WHERE username = ? AND password_hash = ?",
-            (username, password_hash)
-        )
+        cursor.execute(_SQL_SELECT_USER, (username,))
         result = cursor.fetchone()
-        conn.close()
-        return result[0] if result else None
+
+        if not result:
+            # Burn the same hashing cost as a real verification so response
+            # timing doesn't reveal whether the username exists
+            try:
+                _verify_password(_DUMMY_HASH, password)
+            except VerifyMismatchError:
+                pass
+            return None
+
+        user_id, stored_hash = result
+
+        try:
+            _verify_password(stored_hash, password)
+        except (VerifyMismatchError, InvalidHashError):
+            return None
+
+        # Transparently upgrade the stored hash if parameters were bumped
+        if hasher.check_needs_rehash(stored_hash):
+            with conn:
+                conn.execute(_SQL_UPDATE_USER_HASH, (_hash_password(password), user_id))
+
+        with self._auth_cache_lock:
+            self._auth_cache[cache_key] = user_id
+
+        return user_id
     
     def save_cookies(self, user_id: int, website: str, cookies: List[Dict]) -> bool:
         """Save cookies for a user and website"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            for cookie in cookies:
-                cursor.execute('''
-                    INSERT OR REPLACE INTO cookies 
-                    (user_id, website, cookie_name, cookie_value, domain, path, expires, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                ''', (
+            rows = [
+                (
                     user_id,
                     website,
                     cookie.get('name', ''),
@@ -97,84 +230,59 @@ class Database:
                     cookie.get('domain', ''),
                     cookie.get('path', '/'),
                     cookie.get('expires', '')
-                ))
-            
-            conn.commit()
-            conn.close()
+                )
+                for cookie in cookies
+            ]
+
+            conn = self.get_connection()
+            with conn:
+                conn.executemany(_SQL_INSERT_COOKIE, rows)
             return True
         except Exception as e:
             print(f"Error saving cookies: {e}")
             return False
     
-    def get_user_cookies(self, user_id: int, website: str = None) -> List[Dict]:
+    def get_user_cookies(self, user_id: int, website: str = None) -> List[Cookie]:
         """Get cookies for a user, optionally filtered by website"""
         conn = self.get_connection()
         cursor = conn.cursor()
-        
-        if website:
-            cursor.execute('''
-                SELECT id, website, cookie_name, cookie_value, domain, path, 
-                       expires, is_valid, last_validated, created_at
-                FROM cookies 
-                WHERE user_id = ? AND website = ?
-                ORDER BY created_at DESC
-            ''', (user_id, website))
-        else:
-            cursor.execute('''
-                SELECT id, website, cookie_name, cookie_value, domain, path, 
-                       expires, is_valid, last_validated, created_at
-                FROM cookies 
-                WHERE user_id = ?
-                ORDER BY created_at DESC
-            ''', (user_id,))
-        
-        results = cursor.fetchall()
-        conn.close()
-        
-        cookies = []
-        for row in results:
-            cookies.append({
-                'id': row[0],
-                'website': row[1],
-                'name': row[2],
-                'value': row[3],
-                'domain': row[4],
-                'path': row[5],
-                'expires': row[6],
-                'is_valid': row[7],
-                'last_validated': row[8],
-                'created_at': row[9]
-            })
-        
-        return cookies
+        # The row factory emits Cookie records straight from the driver,
+        # skipping the fetchall-then-rebuild pass
+        cursor.row_factory = _cookie_row
+
+        cursor.execute(_SQL_SELECT_COOKIES, (user_id, website, website))
+
+        return cursor.fetchall()
     
     def update_cookie_validity(self, cookie_id: int, is_valid: bool) -> bool:
         """Update cookie validity status"""
         try:
             conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute('''
-                UPDATE cookies 
-                SET is_valid = ?, last_validated = CURRENT_TIMESTAMP
-                WHERE id = ?
-            ''', (is_valid, cookie_id))
-            conn.commit()
-            conn.close()
+            with conn:
+                conn.execute(_SQL_UPDATE_VALIDITY, (is_valid, cookie_id))
             return True
         except Exception:
             return False
     
+    def bulk_update_validity(self, results: List[tuple]) -> bool:
+        """Update validity for many cookies in a single transaction"""
+        try:
+            conn = self.get_connection()
+            with conn:
+                conn.executemany(
+                    _SQL_UPDATE_VALIDITY,
+                    [(is_valid, cookie_id) for cookie_id, is_valid in results]
+                )
+            return True
+        except Exception:
+            return False
+
     def delete_cookie(self, user_id: int, cookie_id: int) -> bool:
         """Delete a cookie belonging to the user"""
         try:
             conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute(
-                "DELETE FROM cookies WHERE id = ? AND user_id = ?",
-                (cookie_id, user_id)
-            )
-            conn.commit()
-            conn.close()
+            with conn:
+                cursor = conn.execute(_SQL_DELETE_COOKIE, (cookie_id, user_id))
             return cursor.rowcount > 0
         except Exception:
             return False
\ No newline at end of file
@@ -0,0 +1,55 @@
+"""
+Optional Numba-accelerated indicator scanning.
+
+Used by cookie_validator as a fallback when pyahocorasick isn't installed
+but numba is: the JIT kernel scans the raw response bytes without
+interpreter overhead, with early exit once the hit threshold is reached.
+Callers must check `available` before calling count_indicators.
+"""
+from functools import lru_cache
+from typing import Tuple
+
+try:
+    import numpy as np
+    from numba import njit
+    available = True
+except ImportError:
+    available = False
+
+if available:
+    @njit(cache=True)
+    def _count_kernel(buf, patterns, starts, lengths, threshold):
+        count = 0
+        for p in range(starts.shape[0]):
+            start = starts[p]
+            length = lengths[p]
+            found = False
+            for i in range(buf.shape[0] - length + 1):
+                match = True
+                for j in range(length):
+                    if buf[i + j] != patterns[start + j]:
+                        match = False
+                        break
+                if match:
+                    found = True
+                    break
+            if found:
+                count += 1
+                if count >= threshold:
+                    return count
+        return count
+
+    @lru_cache(maxsize=8)
+    def _prepare_patterns(indicators: Tuple[bytes, ...]):
+        """Flatten a tuple of byte patterns into kernel-friendly arrays"""
+        patterns = np.frombuffer(b''.join(indicators), dtype=np.uint8)
+        lengths = np.array([len(i) for i in indicators], dtype=np.int64)
+        starts = np.zeros(len(indicators), dtype=np.int64)
+        starts[1:] = np.cumsum(lengths)[:-1]
+        return patterns, starts, lengths
+
+    def count_indicators(data: bytes, indicators: Tuple[bytes, ...], threshold: int = 2) -> int:
+        """Count distinct indicators present in data, stopping at threshold"""
+        patterns, starts, lengths = _prepare_patterns(indicators)
+        buf = np.frombuffer(data, dtype=np.uint8)
+        return int(_count_kernel(buf, patterns, starts, lengths, threshold))
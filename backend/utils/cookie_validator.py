@@ -1,13 +1,143 @@
+import re
+import threading
+
+import cachetools
 import requests
-from datetime import datetime
-from typing import Dict, List, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Dict, List, Tuple, Optional
 from urllib.parse import urlparse
 
+from backend.models.database import Cookie
+from backend.utils import _scan_numba
+
+# Extracts name/value pairs from a raw Cookie header in one C-level pass
+_COOKIE_RE = re.compile(r'\s*([^=;\s]+)\s*=\s*([^;]*?)\s*(?:;|$)')
+
+# Markers suggesting the server bounced us to a login/error page
+_INVALID_INDICATORS = (
+    'login',
+    'sign in',
+    'authentication required',
+    'session expired',
+    'unauthorized',
+    'access denied'
+)
+
+_INDICATOR_BYTES = tuple(indicator.encode() for indicator in _INVALID_INDICATORS)
+
+# ASCII-only lowercasing as a tight C loop over a 256-entry table, versus
+# CPython's per-codepoint Unicode lowering on a decoded str
+_LOWER_LUT = bytes.maketrans(bytes(range(0x41, 0x5B)), bytes(range(0x61, 0x7B)))
+
+# Login/error markers appear near the top of the page, so cap the scan
+_SCAN_LIMIT = 65536
+
+# Bodies below this size aren't worth the JIT call overhead
+_NUMBA_MIN_SIZE = 16384
+
+# Optional single-pass multi-pattern matcher; falls back to per-indicator scans
+try:
+    import ahocorasick
+    _AC = ahocorasick.Automaton()
+    for _idx, _indicator in enumerate(_INVALID_INDICATORS):
+        _AC.add_word(_indicator, _idx)
+    _AC.make_automaton()
+except ImportError:
+    _AC = None
+
+def _count_indicators(data: bytes, threshold: int = 2) -> int:
+    """
+    Count distinct invalid-login indicators in a pre-lowercased byte
+    buffer, stopping at threshold
+    With pyahocorasick installed this is one pass over the buffer instead
+    of one full scan per indicator
+    """
+    if _AC is not None:
+        seen = set()
+        # latin-1 decode is byte-identity; no lowercasing happens here
+        for _, idx in _AC.iter(data.decode('latin-1')):
+            seen.add(idx)
+            if len(seen) >= threshold:
+                break
+        return len(seen)
+
+    if _scan_numba.available and len(data) >= _NUMBA_MIN_SIZE:
+        return _scan_numba.count_indicators(data, _INDICATOR_BYTES, threshold)
+
+    # Each 'in' test is a full scan of the buffer, so stop as soon as the
+    # threshold is reached instead of always checking every indicator
+    count = 0
+    for indicator in _INDICATOR_BYTES:
+        if indicator in data:
+            count += 1
+            if count >= threshold:
+                break
+    return count
+
+# Fallback formats for expiry strings that aren't RFC 1123
+_DATE_FORMATS = (
+    '%a, %d %b %Y %H:%M:%S %Z',
+    '%a, %d-%b-%Y %H:%M:%S %Z',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S'
+)
+
+@lru_cache(maxsize=4096)
+def _parse_expires(expires_str: str) -> Optional[datetime]:
+    """
+    Parse a cookie expiry string into a datetime, or None if unparseable
+    Tries the C-level RFC 1123 parser first (the dominant cookie format),
+    then falls back to strptime; results are memoized since cookies in a
+    batch often share the same expiry string
+    """
+    try:
+        return parsedate_to_datetime(expires_str)
+    except (TypeError, ValueError):
+        pass
+
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(expires_str, fmt)
+        except ValueError:
+            continue
+
+    return None
+
 class CookieValidator:
     def __init__(self):
         self.session = requests.Session()
-    
-    def validate_cookies_for_website(self, website: str, cookies: List[Dict]) -> List[Tuple[int, bool]]:
+        # Recent fetch results keyed by (website, cookie set); repeated
+        # validations within the TTL skip the upstream HTTP hit entirely
+        self._response_cache = cachetools.TTLCache(maxsize=512, ttl=30)
+        self._response_cache_lock = threading.Lock()
+
+    def validate_cookies_for_websites(self, website_cookies: Dict[str, List[Cookie]]) -> List[Tuple[int, bool]]:
+        """
+        Validate cookies for multiple websites concurrently
+        Takes a mapping of website -> cookies and fans the HTTP requests
+        out over a thread pool, so wall-clock time is the slowest site
+        rather than the sum of all round trips
+        Returns list of (cookie_id, is_valid) tuples across all websites
+        """
+        results = []
+
+        if not website_cookies:
+            return results
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            futures = [
+                executor.submit(self.validate_cookies_for_website, website, cookies)
+                for website, cookies in website_cookies.items()
+            ]
+            for future in as_completed(futures):
+                results.extend(future.result())
+
+        return results
+
+    def validate_cookies_for_website(self, website: str, cookies: List[Cookie]) -> List[Tuple[int, bool]]:
         """
         Validate cookies by making a request to the website
         Returns list of (cookie_id, is_valid) tuples
@@ -22,44 +152,28 @@ class CookieValidator:
             # Create cookies dict for requests
             cookie_dict = {}
             cookie_map = {}  # Map cookie names to IDs
-            
+
             for cookie in cookies:
-                cookie_name = cookie.get('name', '')
-                cookie_value = cookie.get('value', '')
-                cookie_id = cookie.get('id')
-                
-                if cookie_name and cookie_value:
-                    cookie_dict[cookie_name] = cookie_value
-                    cookie_map[cookie_name] = cookie_id
+                if cookie.name and cookie.value:
+                    cookie_dict[cookie.name] = cookie.value
+                    cookie_map[cookie.name] = cookie.id
             
             if not cookie_dict:
                 return results
             
-            # Make request with cookies
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            response = self.session.get(
-                website,
-                cookies=cookie_dict,
-                headers=headers,
-                timeout=10,
-                allow_redirects=True
+            status_code, response_head, response_cookies = self._fetch_for_validation(
+                website, cookie_dict
             )
-            
+
             # Check response status
-            is_valid = response.status_code in [200, 201, 202, 301, 302, 304]
-            
-            # Check if cookies were returned/accepted by the server
-            response_cookies = response.cookies.get_dict()
-            
+            is_valid = status_code in [200, 201, 202, 301, 302, 304]
+
             for cookie_name, cookie_id in cookie_map.items():
                 # Cookie is considered valid if:
                 # 1. Request was successful
                 # 2. Cookie wasn't rejected (still present in response or not explicitly removed)
                 cookie_valid = is_valid and self._check_cookie_acceptance(
-                    cookie_name, response, response_cookies
+                    cookie_name, response_head, response_cookies
                 )
                 results.append((cookie_id, cookie_valid))
             
@@ -67,62 +181,98 @@ class CookieValidator:
             print(f"Error validating cookies for {website}: {e}")
             # If there's an error, mark all cookies as potentially invalid
             for cookie in cookies:
-                results.append((cookie.get('id'), False))
+                results.append((cookie.id, False))
         
         return results
     
-    def _check_cookie_acceptance(self, cookie_name: str, response: requests.Response, response_cookies: Dict) -> bool:
+    def _fetch_for_validation(self, website: str, cookie_dict: Dict) -> Tuple[int, bytes, Dict]:
+        """
+        Fetch a website with the given cookies, returning
+        (status_code, response_head, response_cookies)
+        Results are cached for a short TTL so repeated validations of the
+        same cookie set don't re-hit the upstream server
+        """
+        cache_key = (website, frozenset(cookie_dict.items()))
+        with self._response_cache_lock:
+            cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        }
+
+        response = self.session.get(
+            website,
+            cookies=cookie_dict,
+            headers=headers,
+            timeout=10,
+            allow_redirects=True,
+            stream=True
+        )
+
+        # Read the head of the body once; it's shared by all cookie checks
+        result = (
+            response.status_code,
+            self._read_head(response),
+            response.cookies.get_dict()
+        )
+
+        with self._response_cache_lock:
+            self._response_cache[cache_key] = result
+
+        return result
+
+    def _read_head(self, response: requests.Response) -> bytes:
+        """
+        Read at most the first 64 KB of a streamed response body,
+        lowercased through the byte LUT
+        Staying on raw bytes keeps the ASCII indicators matchable without
+        charset detection, a str copy, or Unicode-aware lowercasing
+        """
+        chunks = []
+        size = 0
+        try:
+            for chunk in response.iter_content(8192):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= _SCAN_LIMIT:
+                    break
+        finally:
+            response.close()
+
+        return b''.join(chunks)[:_SCAN_LIMIT].translate(_LOWER_LUT)
+
+    def _check_cookie_acceptance(self, cookie_name: str, response_head: bytes, response_cookies: Dict) -> bool:
         """
         Check if a cookie was accepted by the server
         """
         # If the cookie is returned in the response, it was accepted
         if cookie_name in response_cookies:
             return True
-        
-        # Check if the response contains any authentication errors or login redirects
-        response_text = response.text.lower()
-        
-        # Common indicators that cookies might be invalid
-        invalid_indicators = [
-            'login',
-            'sign in',
-            'authentication required',
-            'session expired',
-            'unauthorized',
-            'access denied'
-        ]
-        
-        # If we find too many invalid indicators, the cookie might be invalid
-        invalid_count = sum(1 for indicator in invalid_indicators if indicator in response_text)
-        
-        # Simple heuristic: if we find multiple invalid indicators, cookie might be invalid
-        return invalid_count < 2
+
+        # Simple heuristic: if we find multiple invalid indicators in the
+        # head of the body, the cookie might be invalid
+        return _count_indicators(response_head) < 2
     
     def parse_cookies_from_header(self, cookie_header: str) -> List[Dict]:
         """
         Parse cookies from a raw cookie header string
         Format: "name1=value1; name2=value2; name3=value3"
         """
-        cookies = []
-        
         if not cookie_header:
-            return cookies
-        
-        cookie_pairs = cookie_header.split(';')
-        
-        for pair in cookie_pairs:
-            pair = pair.strip()
-            if '=' in pair:
-                name, value = pair.split('=', 1)
-                cookies.append({
-                    'name': name.strip(),
-                    'value': value.strip(),
-                    'domain': '',
-                    'path': '/',
-                    'expires': ''
-                })
-        
-        return cookies
+            return []
+
+        return [
+            {
+                'name': match.group(1),
+                'value': match.group(2),
+                'domain': '',
+                'path': '/',
+                'expires': ''
+            }
+            for match in _COOKIE_RE.finditer(cookie_header)
+        ]
     
     def is_cookie_expired(self, expires_str: str) -> bool:
         """
@@ -130,23 +280,10 @@ class CookieValidator:
         """
         if not expires_str:
             return False
-        
-        try:
-            # Try parsing different date formats
-            date_formats = [
-                '%a, %d %b %Y %H:%M:%S %Z',
-                '%a, %d-%b-%Y %H:%M:%S %Z',
-                '%Y-%m-%d %H:%M:%S',
-                '%Y-%m-%dT%H:%M:%S'
-            ]
-            
-            for fmt in date_formats:
-                try:
-                    expires_date = datetime.strptime(expires_str, fmt)
-                    return datetime.now() > expires_date
-                except ValueError:
-                    continue
-            
+
+        expires_date = _parse_expires(expires_str)
+        if expires_date is None:
             return False
-        except Exception:
-            return False
\ No newline at end of file
+
+        now = datetime.now(timezone.utc) if expires_date.tzinfo else datetime.now()
+        return now > expires_date
\ No newline at end of file
@@ -0,0 +1,18 @@
+# cython: language_level=3
+#
+# Pure-Python-mode augmentation for simple_server.py. With Cython
+# installed, build an optional compiled module in place:
+#
+#     cythonize -3 -i simple_server.py
+#
+# The plain .py stays fully importable when Cython isn't available; this
+# file only adds type declarations the compiler can exploit.
+#
+# CookieManagementHandler itself stays a regular class: cdef classes
+# cannot inherit from http.server.BaseHTTPRequestHandler, so its methods
+# compile as ordinary Python methods either way. The typed wins are the
+# module-level helpers on the per-request hot path.
+
+cpdef str _extract_session(str cookie_header)
+
+cpdef dict _load_static()
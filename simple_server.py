@@ -1,24 +1,199 @@
+import atexit
 import http.server
 import socketserver
 import json
+import threading
+import time
 import urllib.parse
 import sqlite3
 import hashlib
+import hmac
 import os
 from datetime import datetime
 from typing import Dict, Any, Optional, Tuple
 
+# orjson serializes at C speed and returns bytes directly; fall back to
+# the stdlib so the server still runs without it
+try:
+    import orjson
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+# Long-lived SQLite connections, one per worker thread; opening and closing
+# a connection per request costs several milliseconds and thrashes the
+# WAL/SHM files
+_conn_pool: Dict[int, sqlite3.Connection] = {}
+_conn_pool_lock = threading.Lock()
+
+# session_id -> (user_id, cached_at); almost every request is authenticated,
+# so caching the lookup saves one SQLite query per request. Entries expire
+# after the TTL and logout evicts immediately.
+_session_cache: Dict[str, Tuple[int, float]] = {}
+_session_cache_lock = threading.Lock()
+_SESSION_CACHE_TTL = 300
+_SESSION_CACHE_MAX = 1024
+
+# Hot-path SQL hoisted to constants so the connection's statement cache
+# sees one stable string per query
+_SQL_GET_SESSION = "SELECT user_id FROM sessions WHERE session_id = ?"
+_SQL_INSERT_SESSION = "INSERT INTO sessions (session_id, user_id) VALUES (?, ?)"
+_SQL_DELETE_SESSION = "DELETE FROM sessions WHERE session_id = ?"
+_SQL_INSERT_USER = "INSERT INTO users (username, password_hash) VALUES (?, ?)"
+_SQL_SELECT_USER_BY_NAME = "SELECT id, password_hash FROM users WHERE username = ?"
+_SQL_GET_USERNAME = "SELECT username FROM users WHERE id = ?"
+
+# RETURNING (SQLite 3.35+) hands back each inserted row id in the same
+# statement, so the frontend gets ids without a follow-up SELECT
+_SQL_INSERT_COOKIE = '''
+    INSERT OR REPLACE INTO cookies
+    (user_id, website, cookie_name, cookie_value, domain, path, expires, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    RETURNING id
+'''
+
+_SQL_SELECT_COOKIES_BY_WEBSITE = '''
+    SELECT id, website, cookie_name, cookie_value, domain, path,
+           expires, is_valid, last_validated, created_at
+    FROM cookies
+    WHERE user_id = ? AND website = ?
+    ORDER BY created_at DESC
+'''
+
+_SQL_SELECT_COOKIES_ALL = '''
+    SELECT id, website, cookie_name, cookie_value, domain, path,
+           expires, is_valid, last_validated, created_at
+    FROM cookies
+    WHERE user_id = ?
+    ORDER BY created_at DESC
+'''
+
+_SQL_VALIDATE_COOKIES = '''
+    UPDATE cookies
+    SET is_valid = 1, last_validated = CURRENT_TIMESTAMP
+    WHERE user_id = ? AND website = ?
+'''
+
+_SQL_DELETE_COOKIE = "DELETE FROM cookies WHERE id = ? AND user_id = ?"
+
+# Column order of the cookie SELECTs above; zipped against each row to
+# build response dicts
+_COOKIE_FIELDS = ('id', 'website', 'name', 'value', 'domain', 'path',
+                  'expires', 'is_valid', 'last_validated', 'created_at')
+
+# Frontend assets, read once at startup and served from memory; three
+# small files fetched on every page view aren't worth a syscall + encode
+# per request
+_STATIC_FILES = {
+    '/': ('frontend/index.html', 'text/html'),
+    '/index.html': ('frontend/index.html', 'text/html'),
+    '/style.css': ('frontend/style.css', 'text/css'),
+    '/script.js': ('frontend/script.js', 'application/javascript'),
+}
+
+def _load_static() -> Dict[str, Tuple[bytes, str]]:
+    """Read the static assets into memory; missing files stay uncached"""
+    cache = {}
+    for path, (filename, content_type) in _STATIC_FILES.items():
+        try:
+            with open(filename, 'rb') as f:
+                cache[path] = (f.read(), content_type)
+        except OSError:
+            pass
+    return cache
+
+_static_cache = _load_static()
+
+# The health-check body never changes, so serialize it once; load
+# balancers tend to poll this endpoint constantly
+_HEALTH_BODY = _json_dumps({'status': 'healthy'})
+_HEALTH_LENGTH = str(len(_HEALTH_BODY))
+
+# Constant error bodies serialized once at import; the error paths then
+# write precomputed bytes with no per-request JSON work, which matters
+# when bots hammer the unauthenticated endpoints
+def _precompute_error(message: str, status: int) -> Tuple[bytes, int]:
+    return _json_dumps({'error': message}), status
+
+_ERR_AUTH = _precompute_error('Authentication required', 401)
+_ERR_NOT_FOUND = _precompute_error('Not found', 404)
+_ERR_FILE_NOT_FOUND = _precompute_error('File not found', 404)
+_ERR_CREDENTIALS = _precompute_error('Invalid credentials', 401)
+_ERR_MISSING_CREDENTIALS = _precompute_error('Username and password required', 400)
+_ERR_WEAK_CREDENTIALS = _precompute_error('Username min 3 chars, password min 6 chars', 400)
+_ERR_USERNAME_TAKEN = _precompute_error('Username already exists', 409)
+_ERR_WEBSITE_REQUIRED = _precompute_error('Website is required', 400)
+_ERR_NO_COOKIES = _precompute_error('No valid cookies provided', 400)
+_ERR_COOKIE_NOT_FOUND = _precompute_error('Cookie not found or access denied', 404)
+_ERR_USER_NOT_FOUND = _precompute_error('User not found', 404)
+_ERR_TOO_LARGE = _precompute_error('Payload too large', 413)
+
+# Upper bound on request bodies; an unbounded Content-Length would let a
+# single request make the server allocate arbitrary memory
+_MAX_BODY = 1 << 20
+
+def _sha256_hex(password: str) -> str:
+    """Password digest shared by register and login
+    Deliberately uncached: memoizing would retain plaintext passwords in
+    process memory, and sha256 of a short string costs about a microsecond"""
+    return hashlib.sha256(password.encode()).hexdigest()
+
+def _extract_session(cookie_header: str) -> Optional[str]:
+    """Pull the session id out of a Cookie header, or None if absent
+    partition does the scan once at C level instead of split building
+    throwaway lists on both sides of the marker"""
+    _, found, rest = cookie_header.partition('session_id=')
+    if not found:
+        return None
+    return rest.partition(';')[0]
+
+@atexit.register
+def _close_conn_pool():
+    """Close pooled SQLite connections on shutdown"""
+    for conn in _conn_pool.values():
+        try:
+            conn.close()
+        except Exception:
+            pass
+
 # Simple cookie management HTTP server
 class CookieManagementHandler(http.server.BaseHTTPRequestHandler):
     db_path = "cookies.db"
+
+    # HTTP/1.1 keeps the TCP connection open between requests, so the
+    # frontend's burst of API and asset GETs after login rides one
+    # connection instead of paying a fresh handshake each. Requires every
+    # response to carry Content-Length or be chunked.
+    protocol_version = "HTTP/1.1"
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+    @classmethod
+    def _get_conn(cls) -> sqlite3.Connection:
+        """Get this thread's long-lived database connection"""
+        ident = threading.get_ident()
+        conn = _conn_pool.get(ident)
+        if conn is None:
+            conn = sqlite3.connect(
+                cls.db_path, check_same_thread=False, cached_statements=256
+            )
+            cursor = conn.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA cache_size=-20000")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            with _conn_pool_lock:
+                _conn_pool[ident] = conn
+        return conn
+
     @classmethod
     def init_db(cls):
         """Initialize the database with required tables"""
-        conn = sqlite3.connect(cls.db_path)
+        conn = cls._get_conn()
         cursor = conn.cursor()
         
         # Users table
@@ -59,9 +234,22 @@ class CookieManagementHandler(http.server.BaseHTTPRequestHandler):
                 FOREIGN KEY (user_id) REFERENCES users (id)
             )
         ''')
-        
+
+        # Composite indexes for the cookie lookups; sessions.session_id is
+        # already covered by its PRIMARY KEY
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_cookies_user_website
+            ON cookies(user_id, website)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_cookies_user_created
+            ON cookies(user_id, created_at DESC)
+        ''')
+
+        # Give the planner statistics to pick the right index
+        cursor.execute("ANALYZE")
+
         conn.commit()
-        conn.close()
 
     def do_OPTIONS(self):
         """Handle CORS preflight requests"""
@@ -70,6 +258,7 @@ class CookieManagementHandler(http.server.BaseHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
         self.send_header('Access-Control-Allow-Credentials', 'true')
+        self.send_header('Content-Length', '0')
         self.end_headers()
 
     def add_cors_headers(self):
@@ -80,15 +269,43 @@ class CookieManagementHandler(http.server.BaseHTTPRequestHandler):
 
     def send_json_response(self, data: Dict[str, Any], status_code: int = 200):
         """Send JSON response"""
+        body = _json_dumps(data)
+        self.send_response(status_code)
+        self.add_cors_headers()
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_chunk(self, data: bytes):
+        """Write one chunked-encoding chunk; data must be non-empty"""
+        self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+
+    def _send_precomputed(self, payload: Tuple[bytes, int]):
+        """Send a body that was serialized at import time"""
+        body, status_code = payload
         self.send_response(status_code)
         self.add_cors_headers()
+        self.send_header('Content-Length', str(len(body)))
+        if self.close_connection:
+            # Tell the client the connection is going away (e.g. after a
+            # 413 whose body was never read) instead of silently closing
+            self.send_header('Connection', 'close')
         self.end_headers()
-        self.wfile.write(json.dumps(data).encode('utf-8'))
+        self.wfile.write(body)
 
-    def get_request_data(self) -> Dict[str, Any]:
-        """Parse JSON request body"""
+    def get_request_data(self) -> Optional[Dict[str, Any]]:
+        """Parse JSON request body
+        Returns None after answering 413 when the declared body size
+        exceeds _MAX_BODY; callers must return immediately on None"""
         try:
             content_length = int(self.headers.get('Content-Length', 0))
+            if content_length > _MAX_BODY:
+                # The oversized body stays unread, so the connection can't
+                # be reused; without this the leftover bytes would be
+                # parsed as the next request under keep-alive
+                self.close_connection = True
+                self._send_precomputed(_ERR_TOO_LARGE)
+                return None
             if content_length > 0:
                 body = self.rfile.read(content_length)
                 return json.loads(body.decode('utf-8'))
@@ -96,209 +313,274 @@ class CookieManagementHandler(http.server.BaseHTTPRequestHandler):
         except Exception:
             return {}
 
+    def _drain_request_body(self):
+        """Consume any unread request body so the next keep-alive request
+        starts at a message boundary
+        Handlers that respond without reading the body (404s, logout) must
+        call this, or the leftover bytes get parsed as the next request"""
+        try:
+            content_length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            return
+        if content_length <= 0:
+            return
+        if content_length > _MAX_BODY:
+            # Not worth reading that much just to keep the connection
+            self.close_connection = True
+            return
+        self.rfile.read(content_length)
+
     def get_session_user(self) -> Optional[int]:
         """Get user ID from session cookie"""
         try:
-            cookie_header = self.headers.get('Cookie', '')
-            if 'session_id=' in cookie_header:
-                session_id = cookie_header.split('session_id=')[1].split(';')[0]
-                
-                conn = sqlite3.connect(self.db_path)
+            session_id = _extract_session(self.headers.get('Cookie', ''))
+            if session_id:
+                now = time.monotonic()
+                with _session_cache_lock:
+                    entry = _session_cache.get(session_id)
+                    if entry is not None and now - entry[1] < _SESSION_CACHE_TTL:
+                        return entry[0]
+
+                conn = self._get_conn()
                 cursor = conn.cursor()
-                cursor.execute("SELECT user_id FROM sessions WHERE session_id = ?", (session_id,))
+                cursor.execute(_SQL_GET_SESSION, (session_id,))
                 result = cursor.fetchone()
-                conn.close()
-                
-                return result[0] if result else None
+
+                if result:
+                    with _session_cache_lock:
+                        # Bound the cache: drop expired entries first, then
+                        # evict oldest-inserted while still at the cap so the
+                        # limit holds even with >1024 live sessions
+                        if len(_session_cache) >= _SESSION_CACHE_MAX:
+                            for sid in [s for s, (_, ts) in _session_cache.items()
+                                        if now - ts >= _SESSION_CACHE_TTL]:
+                                del _session_cache[sid]
+                            while len(_session_cache) >= _SESSION_CACHE_MAX:
+                                del _session_cache[next(iter(_session_cache))]
+                        # Re-insert rather than update in place so dict order
+                        # stays aligned with cache age for the eviction above
+                        _session_cache.pop(session_id, None)
+                        _session_cache[session_id] = (result[0], now)
+                    return result[0]
+                return None
         except Exception:
             pass
         return None
 
     def create_session(self, user_id: int) -> str:
         """Create a new session for user"""
-        import secrets
-        session_id = secrets.token_hex(16)
+        # Same CSPRNG bytes secrets.token_hex would give, without paying
+        # the import-machinery lookup inside the login path
+        session_id = os.urandom(16).hex()
         
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_conn()
         cursor = conn.cursor()
-        cursor.execute("INSERT INTO sessions (session_id, user_id) VALUES (?, ?)", (session_id, user_id))
+        cursor.execute(_SQL_INSERT_SESSION, (session_id, user_id))
         conn.commit()
-        conn.close()
         
         return session_id
 
+    # Exact-path routes resolved with one dict lookup instead of walking
+    # an if/elif chain per request; values are handler method names
+    _GET_ROUTES = {
+        '/api/health': 'handle_health',
+        '/api/user': 'handle_get_user',
+        '/api/cookies': 'handle_get_cookies',
+    }
+
+    _POST_ROUTES = {
+        '/api/register': 'handle_register',
+        '/api/login': 'handle_login',
+        '/api/logout': 'handle_logout',
+        '/api/cookies': 'handle_upload_cookies',
+        '/api/validate': 'handle_validate_cookies',
+    }
+
     def do_POST(self):
         """Handle POST requests"""
-        if self.path == '/api/register':
-            self.handle_register()
-        elif self.path == '/api/login':
-            self.handle_login()
-        elif self.path == '/api/logout':
-            self.handle_logout()
-        elif self.path == '/api/cookies':
-            self.handle_upload_cookies()
-        elif self.path == '/api/validate':
-            self.handle_validate_cookies()
+        handler = self._POST_ROUTES.get(self.path)
+        if handler:
+            getattr(self, handler)()
         else:
-            self.send_json_response({'error': 'Not found'}, 404)
+            self._drain_request_body()
+            self._send_precomputed(_ERR_NOT_FOUND)
 
     def do_GET(self):
         """Handle GET requests"""
-        if self.path == '/api/health':
-            self.send_json_response({'status': 'healthy'})
-        elif self.path == '/api/user':
-            self.handle_get_user()
-        elif self.path.startswith('/api/cookies'):
-            self.handle_get_cookies()
+        path = self.path.partition('?')[0]
+        handler = self._GET_ROUTES.get(path)
+        if handler:
+            getattr(self, handler)()
+        elif path in _STATIC_FILES:
+            self.serve_static_file(path)
         else:
-            # Serve static files
-            if self.path == '/' or self.path == '/index.html':
-                self.serve_static_file('frontend/index.html', 'text/html')
-            elif self.path == '/style.css':
-                self.serve_static_file('frontend/style.css', 'text/css')
-            elif self.path == '/script.js':
-                self.serve_static_file('frontend/script.js', 'application/javascript')
-            else:
-                self.send_json_response({'error': 'Not found'}, 404)
+            self._drain_request_body()
+            self._send_precomputed(_ERR_NOT_FOUND)
 
     def do_DELETE(self):
         """Handle DELETE requests"""
+        # The only parameterized route; everything else is an exact match
         if self.path.startswith('/api/cookies/'):
-            cookie_id = self.path.split('/')[-1]
+            cookie_id = self.path.rsplit('/', 1)[-1]
             self.handle_delete_cookie(cookie_id)
         else:
-            self.send_json_response({'error': 'Not found'}, 404)
+            self._drain_request_body()
+            self._send_precomputed(_ERR_NOT_FOUND)
 
-    def serve_static_file(self, filepath: str, content_type: str):
-        """Serve static files"""
-        try:
-            with open(filepath, 'r', encoding='utf-8') as file:
-                content = file.read()
-                
-                self.send_response(200)
-                self.send_header('Content-Type', content_type)
-                self.send_header('Access-Control-Allow-Origin', 'http://localhost:8000')
-                self.end_headers()
-                self.wfile.write(content.encode('utf-8'))
-        except FileNotFoundError:
-            self.send_json_response({'error': 'File not found'}, 404)
+    def handle_health(self):
+        """Handle health check from precomputed bytes"""
+        self.send_response(200)
+        self.add_cors_headers()
+        self.send_header('Content-Length', _HEALTH_LENGTH)
+        self.end_headers()
+        self.wfile.write(_HEALTH_BODY)
+
+    def serve_static_file(self, path: str):
+        """Serve a static file from the in-memory cache"""
+        asset = _static_cache.get(path)
+        if asset is None:
+            self._send_precomputed(_ERR_FILE_NOT_FOUND)
+            return
+
+        body, content_type = asset
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Access-Control-Allow-Origin', 'http://localhost:8000')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
 
     def handle_register(self):
         """Handle user registration"""
         data = self.get_request_data()
+        if data is None:
+            return
         username = data.get('username', '').strip()
         password = data.get('password', '')
 
         if not username or not password:
-            self.send_json_response({'error': 'Username and password required'}, 400)
+            self._send_precomputed(_ERR_MISSING_CREDENTIALS)
             return
 
         if len(username) < 3 or len(password) < 6:
-            self.send_json_response({'error': 'Username min 3 chars, password min 6 chars'}, 400)
+            self._send_precomputed(_ERR_WEAK_CREDENTIALS)
             return
 
-        password_hash = hashlib.sha256(password.encode()).hexdigest()
+        password_hash = _sha256_hex(password)
 
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_conn()
             cursor = conn.cursor()
-            cursor.execute("INSERT INTO users (username, password_hash) VALUES (?, ?)", (username, password_hash))
+            cursor.execute(_SQL_INSERT_USER, (username, password_hash))
             conn.commit()
-            conn.close()
             self.send_json_response({'message': 'User registered successfully'}, 201)
         except sqlite3.IntegrityError:
-            self.send_json_response({'error': 'Username already exists'}, 409)
+            self._send_precomputed(_ERR_USERNAME_TAKEN)
 
     def handle_login(self):
         """Handle user login"""
         data = self.get_request_data()
+        if data is None:
+            return
         username = data.get('username', '').strip()
         password = data.get('password', '')
 
         if not username or not password:
-            self.send_json_response({'error': 'Username and password required'}, 400)
+            self._send_precomputed(_ERR_MISSING_CREDENTIALS)
             return
 
-        password_hash = hashlib.sha256(password.encode()).hexdigest()
-
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_conn()
         cursor = conn.cursor()
-        cursor.execute("SELECT id FROM users WHERE username = ? AND password_hash = ?", (username, password_hash))
+        cursor.execute(_SQL_SELECT_USER_BY_NAME, (username,))
         result = cursor.fetchone()
-        conn.close()
 
-        if result:
+        # Hash only once the username is known to exist, and compare in
+        # constant time rather than via SQL string equality. (Real
+        # deployments should use a slow salted KDF such as scrypt/argon2;
+        # that's a security change, not a perf one.)
+        if result and hmac.compare_digest(result[1], _sha256_hex(password)):
             user_id = result[0]
             session_id = self.create_session(user_id)
             
+            body = _json_dumps({
+                'message': 'Login successful',
+                'user': {'id': user_id, 'username': username}
+            })
             self.send_response(200)
             self.add_cors_headers()
             self.send_header('Set-Cookie', f'session_id={session_id}; Path=/; HttpOnly')
+            self.send_header('Content-Length', str(len(body)))
             self.end_headers()
-            
-            response = {
-                'message': 'Login successful',
-                'user': {'id': user_id, 'username': username}
-            }
-            self.wfile.write(json.dumps(response).encode('utf-8'))
+            self.wfile.write(body)
         else:
-            self.send_json_response({'error': 'Invalid credentials'}, 401)
+            self._send_precomputed(_ERR_CREDENTIALS)
 
     def handle_logout(self):
         """Handle user logout"""
-        user_id = self.get_session_user()
-        if user_id:
-            # Clear session from database
-            cookie_header = self.headers.get('Cookie', '')
-            if 'session_id=' in cookie_header:
-                session_id = cookie_header.split('session_id=')[1].split(';')[0]
-                
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-                cursor.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
-                conn.commit()
-                conn.close()
+        # Logout never reads a body, but a client may still send one
+        self._drain_request_body()
+
+        # The DELETE is a no-op for unknown session ids, so there's no need
+        # to SELECT the session first just to decide whether to delete it
+        session_id = _extract_session(self.headers.get('Cookie', ''))
+        if session_id:
+            conn = self._get_conn()
+            cursor = conn.cursor()
+            cursor.execute(_SQL_DELETE_SESSION, (session_id,))
+            conn.commit()
+
+            with _session_cache_lock:
+                _session_cache.pop(session_id, None)
 
+        body = _json_dumps({'message': 'Logged out successfully'})
         self.send_response(200)
         self.add_cors_headers()
         self.send_header('Set-Cookie', 'session_id=; Path=/; Expires=Thu, 01 Jan 1970 00:00:00 GMT')
+        self.send_header('Content-Length', str(len(body)))
         self.end_headers()
-        self.wfile.write(json.dumps({'message': 'Logged out successfully'}).encode('utf-8'))
+        self.wfile.write(body)
 
     def handle_get_user(self):
         """Handle get current user"""
         user_id = self.get_session_user()
         if not user_id:
-            self.send_json_response({'error': 'Authentication required'}, 401)
+            # The 401 goes out before the body is ever read; drain it so
+            # the keep-alive connection stays at a message boundary
+            self._drain_request_body()
+            self._send_precomputed(_ERR_AUTH)
             return
 
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_conn()
         cursor = conn.cursor()
-        cursor.execute("SELECT username FROM users WHERE id = ?", (user_id,))
+        cursor.execute(_SQL_GET_USERNAME, (user_id,))
         result = cursor.fetchone()
-        conn.close()
 
         if result:
             self.send_json_response({
                 'user': {'id': user_id, 'username': result[0]}
             })
         else:
-            self.send_json_response({'error': 'User not found'}, 404)
+            self._send_precomputed(_ERR_USER_NOT_FOUND)
 
     def handle_upload_cookies(self):
         """Handle cookie upload"""
         user_id = self.get_session_user()
         if not user_id:
-            self.send_json_response({'error': 'Authentication required'}, 401)
+            # The 401 goes out before the body is ever read; drain it so
+            # the keep-alive connection stays at a message boundary
+            self._drain_request_body()
+            self._send_precomputed(_ERR_AUTH)
             return
 
         data = self.get_request_data()
+        if data is None:
+            return
         website = data.get('website', '').strip()
         cookie_header = data.get('cookie_header', '').strip()
         cookies_data = data.get('cookies', [])
 
         if not website:
-            self.send_json_response({'error': 'Website is required'}, 400)
+            self._send_precomputed(_ERR_WEBSITE_REQUIRED)
             return
 
         cookies = []
@@ -317,39 +599,45 @@ class CookieManagementHandler(http.server.BaseHTTPRequestHandler):
                 cookies.append(cookie)
 
         if not cookies:
-            self.send_json_response({'error': 'No valid cookies provided'}, 400)
+            self._send_precomputed(_ERR_NO_COOKIES)
             return
 
-        # Save to database
+        # Save to database in one transaction. RETURNING rules out
+        # executemany, but the per-row execute reuses the same cached
+        # prepared statement and there is still one fsync total.
+        conn = self._get_conn()
         try:
-            conn = sqlite3.connect(self.db_path)
+            params = [
+                (user_id, website, cookie.get('name', ''), cookie.get('value', ''),
+                 cookie.get('domain', ''), cookie.get('path', '/'), cookie.get('expires', ''))
+                for cookie in cookies
+            ]
+
             cursor = conn.cursor()
-            
-            for cookie in cookies:
-                cursor.execute('''
-                    INSERT OR REPLACE INTO cookies 
-                    (user_id, website, cookie_name, cookie_value, domain, path, expires, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                ''', (
-                    user_id, website, cookie.get('name', ''), cookie.get('value', ''),
-                    cookie.get('domain', ''), cookie.get('path', '/'), cookie.get('expires', '')
-                ))
-            
+            conn.execute("BEGIN IMMEDIATE")
+            cookie_ids = [
+                cursor.execute(_SQL_INSERT_COOKIE, row).fetchone()[0]
+                for row in params
+            ]
             conn.commit()
-            conn.close()
-            
+
             self.send_json_response({
                 'message': f'Successfully uploaded {len(cookies)} cookies for {website}',
+                'ids': cookie_ids,
                 'count': len(cookies)
             }, 201)
         except Exception as e:
+            conn.rollback()
             self.send_json_response({'error': f'Failed to save cookies: {str(e)}'}, 500)
 
     def handle_get_cookies(self):
         """Handle get cookies"""
         user_id = self.get_session_user()
         if not user_id:
-            self.send_json_response({'error': 'Authentication required'}, 401)
+            # The 401 goes out before the body is ever read; drain it so
+            # the keep-alive connection stays at a message boundary
+            self._drain_request_body()
+            self._send_precomputed(_ERR_AUTH)
             return
 
         # Parse query parameters
@@ -357,67 +645,70 @@ class CookieManagementHandler(http.server.BaseHTTPRequestHandler):
         query_params = urllib.parse.parse_qs(parsed_url.query)
         website = query_params.get('website', [None])[0]
 
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_conn()
         cursor = conn.cursor()
+        # Pull rows off the driver 256 at a time instead of one by one
+        cursor.arraysize = 256
 
         if website:
-            cursor.execute('''
-                SELECT id, website, cookie_name, cookie_value, domain, path, 
-                       expires, is_valid, last_validated, created_at
-                FROM cookies 
-                WHERE user_id = ? AND website = ?
-                ORDER BY created_at DESC
-            ''', (user_id, website))
+            cursor.execute(_SQL_SELECT_COOKIES_BY_WEBSITE, (user_id, website))
         else:
-            cursor.execute('''
-                SELECT id, website, cookie_name, cookie_value, domain, path, 
-                       expires, is_valid, last_validated, created_at
-                FROM cookies 
-                WHERE user_id = ?
-                ORDER BY created_at DESC
-            ''', (user_id,))
+            cursor.execute(_SQL_SELECT_COOKIES_ALL, (user_id,))
 
-        results = cursor.fetchall()
-        conn.close()
+        # Chunked framing is HTTP/1.1-only; older clients get a buffered
+        # Content-Length response instead of raw chunk headers in the body
+        if self.request_version != 'HTTP/1.1':
+            cookies = [dict(zip(_COOKIE_FIELDS, row)) for row in cursor.fetchall()]
+            self.send_json_response({'cookies': cookies, 'count': len(cookies)})
+            return
 
-        cookies = []
-        for row in results:
-            cookies.append({
-                'id': row[0], 'website': row[1], 'name': row[2], 'value': row[3],
-                'domain': row[4], 'path': row[5], 'expires': row[6],
-                'is_valid': row[7], 'last_validated': row[8], 'created_at': row[9]
-            })
+        # Stream rows into the socket as they come off the cursor instead
+        # of materializing list + dicts + full JSON body (about 3x the
+        # response size at peak for large cookie sets). The length isn't
+        # known up front, so chunked encoding keeps the HTTP/1.1
+        # connection reusable.
+        self.send_response(200)
+        self.add_cors_headers()
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
 
-        self.send_json_response({'cookies': cookies, 'count': len(cookies)})
+        self._write_chunk(b'{"cookies":[')
+        count = 0
+        for row in cursor:
+            sep = b',' if count else b''
+            self._write_chunk(sep + _json_dumps(dict(zip(_COOKIE_FIELDS, row))))
+            count += 1
+        self._write_chunk(b'],"count":%d}' % count)
+        self.wfile.write(b'0\r\n\r\n')
 
     def handle_validate_cookies(self):
         """Handle cookie validation"""
         user_id = self.get_session_user()
         if not user_id:
-            self.send_json_response({'error': 'Authentication required'}, 401)
+            # The 401 goes out before the body is ever read; drain it so
+            # the keep-alive connection stays at a message boundary
+            self._drain_request_body()
+            self._send_precomputed(_ERR_AUTH)
             return
 
         data = self.get_request_data()
+        if data is None:
+            return
         website = data.get('website', '').strip()
 
         if not website:
-            self.send_json_response({'error': 'Website is required'}, 400)
+            self._send_precomputed(_ERR_WEBSITE_REQUIRED)
             return
 
         # Simple validation - just mark as valid for demo
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_conn()
             cursor = conn.cursor()
             
-            cursor.execute('''
-                UPDATE cookies 
-                SET is_valid = 1, last_validated = CURRENT_TIMESTAMP
-                WHERE user_id = ? AND website = ?
-            ''', (user_id, website))
+            cursor.execute(_SQL_VALIDATE_COOKIES, (user_id, website))
             
             updated_rows = cursor.rowcount
             conn.commit()
-            conn.close()
 
             self.send_json_response({
                 'message': f'Validated {updated_rows} cookies for {website}',
@@ -430,22 +721,24 @@ class CookieManagementHandler(http.server.BaseHTTPRequestHandler):
         """Handle cookie deletion"""
         user_id = self.get_session_user()
         if not user_id:
-            self.send_json_response({'error': 'Authentication required'}, 401)
+            # The 401 goes out before the body is ever read; drain it so
+            # the keep-alive connection stays at a message boundary
+            self._drain_request_body()
+            self._send_precomputed(_ERR_AUTH)
             return
 
         try:
             cookie_id = int(cookie_id)
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_conn()
             cursor = conn.cursor()
-            cursor.execute("DELETE FROM cookies WHERE id = ? AND user_id = ?", (cookie_id, user_id))
+            cursor.execute(_SQL_DELETE_COOKIE, (cookie_id, user_id))
             conn.commit()
             deleted_rows = cursor.rowcount
-            conn.close()
 
             if deleted_rows > 0:
                 self.send_json_response({'message': 'Cookie deleted successfully'})
             else:
-                self.send_json_response({'error': 'Cookie not found or access denied'}, 404)
+                self._send_precomputed(_ERR_COOKIE_NOT_FOUND)
         except (ValueError, Exception) as e:
             self.send_json_response({'error': f'Failed to delete cookie: {str(e)}'}, 500)
 
@@ -455,7 +748,20 @@ if __name__ == '__main__':
     # Create database
     CookieManagementHandler.init_db()
     
-    with socketserver.TCPServer(("", PORT), CookieManagementHandler) as httpd:
+    # Threaded server so requests (and their SQLite round trips) don't
+    # serialize behind each other; each worker thread gets its own pooled
+    # connection via _get_conn
+    #
+    # Shrinking the per-thread stack from the multi-MB platform default is
+    # what lets thread-per-connection hold many idle connections; the
+    # handler's call depth needs nowhere near the default. A deeper accept
+    # backlog absorbs connection bursts instead of refusing them.
+    threading.stack_size(256 * 1024)
+    socketserver.ThreadingTCPServer.daemon_threads = True
+    socketserver.ThreadingTCPServer.allow_reuse_address = True
+    socketserver.ThreadingTCPServer.request_queue_size = 128
+
+    with socketserver.ThreadingTCPServer(("", PORT), CookieManagementHandler) as httpd:
         print(f"Cookie Management System running at http://localhost:{PORT}")
         print(f"Open http://localhost:{PORT} in your browser")
         try:
@@ -0,0 +1,13 @@
+"""
+WSGI entry point for production servers.
+
+The validate endpoint spends nearly all its time waiting on outbound
+HTTP, so run it under gevent workers that yield on socket I/O:
+
+    gunicorn -k gevent -w 4 --worker-connections 1000 wsgi:application
+"""
+# Patch the stdlib before anything imports socket/ssl (requests in particular)
+from gevent import monkey
+monkey.patch_all()
+
+from backend.app import app as application